@@ -5,6 +5,7 @@ namespace esphome
   EHMTX::EHMTX() : PollingComponent(TICKINTERVAL)
   {
     this->store = new EHMTX_store(this);
+    this->text_widths = new EHMTX_textwidth();
     this->icon_screen = new EHMTX_screen(this);
     this->show_screen = false;
     this->show_gauge = false;
@@ -289,9 +290,7 @@ namespace esphome
         ++i;
         if (i < this->icon_count)
         {
-          int x, y, w, h;
-          this->display->get_text_bounds(0, 0, this->icons[i]->name.c_str(), this->font, display::TextAlign::LEFT, &x, &y, &w, &h);
-          this->icon_screen->set_text(this->icons[i]->name, i, w, 1,1);
+          this->icon_screen->set_text(this->icons[i]->name, i, this->text_width(this->icons[i]->name), 1,1);
           ESP_LOGD(TAG, "show all icons icon: %d name: %s", i, this->icons[i]->name.c_str());
         }
         else
@@ -428,6 +427,27 @@ namespace esphome
     this->font = font;
   }
 
+  void EHMTX::set_glyph_widths(const int8_t *widths)
+  {
+    this->text_widths->set_glyph_widths(widths);
+  }
+
+  uint16_t EHMTX::text_width(std::string text)
+  {
+    uint16_t w;
+    if (!this->text_widths->find(text, &w))
+    {
+      if (!this->text_widths->table_width(text, &w))
+      {
+        int x, y, width, h;
+        this->display->get_text_bounds(0, 0, text.c_str(), this->font, display::TextAlign::LEFT, &x, &y, &width, &h);
+        w = width;
+      }
+      this->text_widths->insert(text, w);
+    }
+    return w;
+  }
+
   void EHMTX::set_frame_interval(uint16_t fi)
   {
     this->frame_interval = fi;
@@ -481,10 +501,8 @@ namespace esphome
     }
     EHMTX_screen *screen = this->store->find_free_screen(icon);
 
-    int x, y, w, h;
-    this->display->get_text_bounds(0, 0, text.c_str(), this->font, display::TextAlign::LEFT, &x, &y, &w, &h);
     screen->alarm = alarm;
-    screen->set_text(text, icon, w, lifetime, show_time);
+    screen->set_text(text, icon, this->text_width(text), lifetime, show_time);
     screen->text_color= this->text_color;
   }
 
@@ -623,6 +641,7 @@ namespace esphome
     ESP_LOGCONFIG(TAG, "EspHoMatriX %s", EHMTX_VERSION);
     ESP_LOGCONFIG(TAG, "Icons: %d of %d", this->icon_count, MAXICONS);
     ESP_LOGCONFIG(TAG, "Font offset: x=%d y=%d", this->xoffset, this->yoffset);
+    ESP_LOGCONFIG(TAG, "Glyph width table: %s", this->text_widths->has_glyph_widths() ? "yes" : "no");
     ESP_LOGCONFIG(TAG, "Max screens: %d", MAXQUEUE);
     ESP_LOGCONFIG(TAG, "Date format: %s", this->date_fmt.c_str());
     ESP_LOGCONFIG(TAG, "Time format: %s", this->time_fmt.c_str());
@@ -655,10 +674,8 @@ namespace esphome
 
   void EHMTX::show_all_icons()
   {
-    int x, y, w, h;
     ESP_LOGD(TAG, "show all icons icon: %s", this->icons[0]->name.c_str());
-    this->display->get_text_bounds(0, 0, this->icons[0]->name.c_str(), this->font, display::TextAlign::LEFT, &x, &y, &w, &h);
-    this->icon_screen->set_text(this->icons[0]->name, 0, w, 1,1);
+    this->icon_screen->set_text(this->icons[0]->name, 0, this->text_width(this->icons[0]->name), 1,1);
     this->show_icons = true;
   }
 
@@ -1,6 +1,7 @@
 #ifndef EHMTX_H
 #define EHMTX_H
 #include "esphome.h"
+#include "EHMTX_textwidth.h"
 
 const uint8_t MAXQUEUE = 24;
 const uint8_t MAXICONS = 90;
@@ -37,6 +38,7 @@ namespace esphome
     std::vector<EHMTXNextScreenTrigger *> on_next_screen_triggers_;
     std::vector<EHMTXNextClockTrigger *> on_next_clock_triggers_;
     void internal_add_screen(uint8_t icon, std::string text, uint16_t lifetime,uint16_t show_time, bool alarm);
+    EHMTX_textwidth *text_widths;
 
   public:
     EHMTX();
@@ -100,6 +102,8 @@ namespace esphome
     void del_screen(std::string iname);
     void set_clock(time::RealTimeClock *clock);
     void set_font(display::Font *font);
+    void set_glyph_widths(const int8_t *widths);
+    uint16_t text_width(std::string text);
     void set_frame_interval(uint16_t interval);
     void set_scroll_interval(uint16_t interval);
     void set_scroll_count(uint8_t count);
@@ -552,13 +556,15 @@ template <typename... Ts>
   {
   protected:
     bool counting_up;
+    const uint16_t *frame_durations_; // per frame duration in ms, nullptr if all frames are equal
 
   public:
-    EHMTX_Icon(const uint8_t *data_start, int width, int height, uint32_t animation_frame_count, display::ImageType type, std::string icon_name, bool revers, uint16_t frame_duration);
+    EHMTX_Icon(const uint8_t *data_start, int width, int height, uint32_t animation_frame_count, display::ImageType type, std::string icon_name, bool revers, uint16_t frame_duration, const uint16_t *frame_durations);
     std::string name;
     uint16_t frame_duration;
     bool fullscreen;
     void next_frame();
+    uint16_t get_frame_duration();
     bool reverse;
   };
 }
@@ -3,12 +3,13 @@
 namespace esphome
 {
 
-  EHMTX_Icon::EHMTX_Icon(const uint8_t *data_start, int width, int height, uint32_t animation_frame_count, display::ImageType type, std::string icon_name, bool revers, uint16_t frame_duration)
+  EHMTX_Icon::EHMTX_Icon(const uint8_t *data_start, int width, int height, uint32_t animation_frame_count, display::ImageType type, std::string icon_name, bool revers, uint16_t frame_duration, const uint16_t *frame_durations)
       : Animation(data_start, width, height, animation_frame_count, type)
   {
     this->name = icon_name;
     this->reverse = revers;
     this->frame_duration = frame_duration;
+    this->frame_durations_ = frame_durations;
     this->fullscreen = width == 32;
     this->counting_up = true;
   }
@@ -35,4 +36,13 @@ namespace esphome
       }
     }
   }
+
+  uint16_t EHMTX_Icon::get_frame_duration()
+  {
+    if (this->frame_durations_ == nullptr)
+    {
+      return this->frame_duration;
+    }
+    return progmem_read_uint16(this->frame_durations_ + this->get_current_frame());
+  }
 }
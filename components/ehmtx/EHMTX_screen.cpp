@@ -41,7 +41,7 @@ namespace esphome
       }
       this->config_->last_scroll_time = millis();
     }
-    if (millis() - this->config_->last_anim_time >= this->config_->icons[this->icon]->frame_duration)
+    if (millis() - this->config_->last_anim_time >= this->config_->icons[this->icon]->get_frame_duration())
     {
       this->config_->icons[this->icon]->next_frame();
       this->config_->last_anim_time = millis();
@@ -127,11 +127,15 @@ namespace esphome
     this->pixels_ = pixel;
     
     if (pixel < 23) {
-      this->centerx_ = ceil((22-pixel)/2);
+      this->centerx_ = (22-pixel)/2;
+    }
+    else {
+      this->centerx_ = 0;
     }
     
     this->shiftx_ = 0;
-    float display_duration = ceil((this->config_->scroll_count * (TEXTSTARTOFFSET + pixel) * this->config_->scroll_interval) / 1000);
+    // round up to full seconds, so the last scroll is not cut off
+    uint16_t display_duration = ((uint32_t)this->config_->scroll_count * (TEXTSTARTOFFSET + pixel) * this->config_->scroll_interval + 999) / 1000;
     this->screen_time = (display_duration > show_time) ? display_duration : show_time;
     ESP_LOGD(TAG, "display length text: %s pixels %d calculated: %d show_time: %d default: %d", text.c_str(), pixel, this->screen_time, show_time, this->config_->screen_time);
     this->endtime = this->config_->clock->now().timestamp + et * 60;
@@ -0,0 +1,95 @@
+#include "EHMTX_textwidth.h"
+#include <algorithm>
+
+namespace esphome
+{
+  EHMTX_textwidth::EHMTX_textwidth()
+  {
+    this->glyph_widths_ = nullptr;
+    this->count_ = 0;
+  }
+
+  void EHMTX_textwidth::set_glyph_widths(const int8_t *widths)
+  {
+    this->glyph_widths_ = widths;
+  }
+
+  bool EHMTX_textwidth::has_glyph_widths()
+  {
+    return this->glyph_widths_ != nullptr;
+  }
+
+  bool EHMTX_textwidth::table_width(const std::string &text, uint16_t *width)
+  {
+    // same as Font::measure, but summing up the generated table
+    if (this->glyph_widths_ == nullptr)
+    {
+      return false;
+    }
+    int x = 0;
+    int min_x = 0;
+    bool has_char = false;
+    for (char c : text)
+    {
+      uint8_t ch = (uint8_t)c;
+      if (ch > 127)
+      {
+        return false;
+      }
+      int8_t offset_x = this->glyph_widths_[2 * ch];
+      int8_t advance = this->glyph_widths_[2 * ch + 1];
+      if (offset_x != GLYPH_UNKNOWN)
+      {
+        if (!has_char)
+        {
+          min_x = offset_x;
+        }
+        else
+        {
+          min_x = std::min(min_x, x + offset_x);
+        }
+        has_char = true;
+      }
+      x += advance;
+    }
+    *width = x - min_x;
+    return true;
+  }
+
+  bool EHMTX_textwidth::find(const std::string &text, uint16_t *width)
+  {
+    // least recently used cache, the first entry is the newest
+    uint8_t i = 0;
+    while (i < this->count_ && this->text_[i] != text)
+    {
+      i++;
+    }
+    if (i == this->count_)
+    {
+      return false;
+    }
+    *width = this->pixel_[i];
+    for (; i > 0; i--)
+    {
+      std::swap(this->text_[i], this->text_[i - 1]);
+      std::swap(this->pixel_[i], this->pixel_[i - 1]);
+    }
+    return true;
+  }
+
+  void EHMTX_textwidth::insert(const std::string &text, uint16_t width)
+  {
+    // the last entry is dropped if the cache is full
+    if (this->count_ < TEXTWIDTHCACHE)
+    {
+      this->count_++;
+    }
+    for (uint8_t i = this->count_ - 1; i > 0; i--)
+    {
+      this->text_[i] = std::move(this->text_[i - 1]);
+      this->pixel_[i] = this->pixel_[i - 1];
+    }
+    this->text_[0] = text;
+    this->pixel_[0] = width;
+  }
+}
@@ -0,0 +1,29 @@
+#ifndef EHMTX_TEXTWIDTH_H
+#define EHMTX_TEXTWIDTH_H
+#include <cstdint>
+#include <string>
+
+const uint8_t TEXTWIDTHCACHE = 8;  // recently measured texts
+const int8_t GLYPH_UNKNOWN = -128; // offset_x of a char without glyph
+
+namespace esphome
+{
+  class EHMTX_textwidth
+  {
+  protected:
+    const int8_t *glyph_widths_; // offset_x and advance per ascii char
+    std::string text_[TEXTWIDTHCACHE];
+    uint16_t pixel_[TEXTWIDTHCACHE];
+    uint8_t count_;
+
+  public:
+    EHMTX_textwidth();
+    void set_glyph_widths(const int8_t *widths);
+    bool has_glyph_widths();
+    bool table_width(const std::string &text, uint16_t *width);
+    bool find(const std::string &text, uint16_t *width);
+    void insert(const std::string &text, uint16_t width);
+  };
+}
+
+#endif
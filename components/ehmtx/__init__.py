@@ -8,20 +8,24 @@ from esphome.components import display, font, time
 import esphome.components.image as espImage
 import esphome.config_validation as cv
 import esphome.codegen as cg
-from esphome.const import CONF_BLUE, CONF_GREEN, CONF_RED, CONF_FILE, CONF_ID, CONF_BRIGHTNESS, CONF_RAW_DATA_ID,  CONF_TIME, CONF_TRIGGER_ID
+from esphome.const import CONF_BLUE, CONF_GREEN, CONF_RED, CONF_FILE, CONF_ID, CONF_BRIGHTNESS, CONF_RAW_DATA_ID,  CONF_TIME, CONF_TRIGGER_ID, CONF_GLYPHS, CONF_SIZE, CONF_PATH, CONF_GAMMA_CORRECT
 from esphome.core import CORE, HexInt
 from esphome.cpp_generator import RawExpression
 
+from .glyph_widths import glyph_width_data, ttf_glyph_metrics
+from .rgb565 import rgb565_lut
+
 _LOGGER = logging.getLogger(__name__)
 
 DEPENDENCIES = ["display", "light", "api"]
 AUTO_LOAD = ["ehmtx"]
 IMAGE_TYPE_RGB565 = 4
 MAXFRAMES = 110
+MAXFRAMEDURATION = 65535
+DEFAULT_GAMMA = 2.8
 MAXICONS = 90
 ICONWIDTH = 8
 ICONHEIGHT = 8
-ICONBUFFERSIZE = ICONWIDTH * ICONHEIGHT * 4
 SVG_ICONSTART = '<svg width="80px" height="80px" viewBox="0 0 80 80">'
 SVG_FULLSCREENSTART = '<svg width="320px" height="80px" viewBox="0 0 320 80">'
 SVG_END = "</svg>"
@@ -34,6 +38,39 @@ logging.warning(f"")
 def rgb565_svg(x,y,r,g,b):
     return f"<rect style=\"fill:rgb({(r << 3) | (r >> 2)},{(g << 2) | (g >> 4)},{(b << 3) | (b >> 2)});\" x=\"{x*10}\" y=\"{y*10}\" width=\"10\" height=\"10\"/>"
 
+def light_gamma(display_id):
+    # gamma_correct of the light behind the addressable_light display
+    light_id = None
+    for conf in CORE.config.get("display", []):
+        if str(conf[CONF_ID]) == str(display_id):
+            light_id = conf.get(CONF_ADDRESSABLE_LIGHT_ID)
+    for conf in CORE.config.get("light", []):
+        if light_id is not None and str(conf[CONF_ID]) == str(light_id):
+            return conf.get(CONF_GAMMA_CORRECT, DEFAULT_GAMMA)
+    return DEFAULT_GAMMA
+
+def glyph_width_table(font_id):
+    # offset_x and advance per ascii char of the font used by ehmtx
+    from PIL import ImageFont
+
+    fontconf = None
+    for conf in CORE.config.get("font", []):
+        if str(conf[CONF_ID]) == str(font_id):
+            fontconf = conf
+    if fontconf is None:
+        return None
+
+    fontfile = fontconf[CONF_FILE]
+    if isinstance(fontfile, dict):
+        if CONF_PATH not in fontfile:
+            return None
+        fontfile = fontfile[CONF_PATH]
+    path = CORE.relative_config_path(fontfile)
+    ttf = ImageFont.truetype(str(path), fontconf[CONF_SIZE])
+
+    glyphs = fontconf[CONF_GLYPHS]
+    return glyph_width_data(glyphs, ttf_glyph_metrics(ttf, glyphs))
+
 ehmtx_ns = cg.esphome_ns.namespace("esphome")
 EHMTX_ = ehmtx_ns.class_("EHMTX", cg.Component)
 Icons_ = ehmtx_ns.class_("EHMTX_Icon")
@@ -59,13 +96,17 @@ CONF_ICONS = "icons"
 CONF_SHOWDOW = "show_dow"
 CONF_SHOWDATE = "show_date"
 CONF_FRAMEDURATION = "frame_duration"
+CONF_DURATIONS_ID = "durations_id"
 CONF_HOLD_TIME = "hold_time"
 CONF_SCROLLCOUNT = "scroll_count"
 CONF_MATRIXCOMPONENT = "matrix_component"
 CONF_HTML = "icons2html"
 CONF_SCROLLINTERVAL = "scroll_interval"
 CONF_FRAMEINTERVAL = "frame_interval"
+CONF_GAMMAQUANTIZE = "icon_gamma_quantization"
+CONF_ADDRESSABLE_LIGHT_ID = "addressable_light_id"
 CONF_FONT_ID = "font_id"
+CONF_GLYPHWIDTHS_ID = "glyph_widths_id"
 CONF_YOFFSET = "yoffset"
 CONF_XOFFSET = "xoffset"
 CONF_PINGPONG = "pingpong"
@@ -84,6 +125,7 @@ EHMTX_SCHEMA = cv.Schema({
     cv.Required(CONF_TIMECOMPONENT): cv.use_id(time),
     cv.Required(CONF_MATRIXCOMPONENT): cv.use_id(display),
     cv.Required(CONF_FONT_ID): cv.use_id(font),
+    cv.GenerateID(CONF_GLYPHWIDTHS_ID): cv.declare_id(cg.int8),
     cv.Optional(
         CONF_CLOCKTIME, default="5"
     ): cv.templatable(cv.positive_int),
@@ -133,6 +175,9 @@ EHMTX_SCHEMA = cv.Schema({
     cv.Optional(
         CONF_SCREENTIME, default="8"
     ): cv.templatable(cv.positive_int),
+    cv.Optional(
+        CONF_GAMMAQUANTIZE, default=False
+    ): cv.boolean,
     cv.Optional(CONF_BRIGHTNESS, default=80): cv.templatable(cv.int_range(min=0, max=255)),
     cv.Optional(CONF_ON_NEXT_SCREEN): automation.validate_automation(
         {
@@ -159,6 +204,7 @@ EHMTX_SCHEMA = cv.Schema({
                     CONF_PINGPONG, default=False
                 ): cv.boolean,
                 cv.GenerateID(CONF_RAW_DATA_ID): cv.declare_id(cg.uint8),
+                cv.GenerateID(CONF_DURATIONS_ID): cv.declare_id(cg.uint16),
             }
         ),
         cv.Length(max=MAXICONS),
@@ -586,6 +632,14 @@ async def to_code(config):
     svg { padding-top: 2x; padding-right: 2px; padding-bottom: 2px; padding-left: 2px; }
     </STYLE><BODY>\
 '''
+    gamma = None
+    if config[CONF_GAMMAQUANTIZE]:
+        gamma = light_gamma(config[CONF_MATRIXCOMPONENT])
+        logging.info(f"EsphoMaTrix: quantize icon colors for gamma {gamma}")
+    lut_r = rgb565_lut(5, gamma)
+    lut_g = rgb565_lut(6, gamma)
+    lut_b = rgb565_lut(5, gamma)
+
     for conf in config[CONF_ICONS]:
                 
         if CONF_FILE in conf:
@@ -608,58 +662,88 @@ async def to_code(config):
         width, height = image.size
 
         if hasattr(image, 'n_frames'):
-            frames = min(image.n_frames, MAXFRAMES)
+            frames = image.n_frames
         else:
             frames = 1
 
         if ((width != 4*ICONWIDTH) or (width != ICONWIDTH)) and (height != ICONHEIGHT):
             logging.warning(f" icon wrong size valid 8x8 or 8x32: {conf[CONF_ID]} skipped!")
         else:
-            if (conf[CONF_FRAMEDURATION] == 0):
-                try:
-                    duration =  image.info['duration']         
-                except:
-                    duration = config[CONF_FRAMEINTERVAL]
-            else:
-                duration = conf[CONF_FRAMEDURATION]
+            html_string += F"<BR><B>{conf[CONF_ID]}</B>&nbsp;-&nbsp;"
 
-            html_string += F"<BR><B>{conf[CONF_ID]}</B>&nbsp;-&nbsp;({duration} ms):<BR>"
-
-            pos = 0 
+            # collect the frames, identical consecutive frames are merged
+            # into one frame showing for the sum of their durations
+            frame_data = []
+            runs = []
             frameIndex = 0
-            html_string += f"<DIV ID={conf[CONF_ID]}>"
-            data = [0 for _ in range(ICONBUFFERSIZE * 2 * frames)]
             for frameIndex in range(frames):
                 
                 image.seek(frameIndex)
+                if (conf[CONF_FRAMEDURATION] == 0):
+                    duration = image.info.get('duration', 0)
+                    if duration == 0:
+                        duration = config[CONF_FRAMEINTERVAL]
+                else:
+                    duration = conf[CONF_FRAMEDURATION]
+
                 frame = image.convert("RGB")
                 pixels = list(frame.getdata())
-                width, height = image.size
+                data = []
+                for pix in pixels:
+                    R = lut_r[pix[0]]
+                    G = lut_g[pix[1]]
+                    B = lut_b[pix[2]]
+                    rgb = (R << 11) | (G << 5) | B
+                    data.append(rgb >> 8)
+                    data.append(rgb & 255)
+
+                if len(frame_data) > 0 and frame_data[-1] == data:
+                    runs[-1].append(duration)
+                elif len(frame_data) < MAXFRAMES:
+                    frame_data.append(data)
+                    runs.append([duration])
+                else:
+                    break
+
+            frames = len(frame_data)
+            durations = [sum(run) for run in runs]
+            if conf[CONF_PINGPONG] and frames > 1:
+                # pingpong shows the first and last frame once per cycle, but the
+                # other frames of a merged run at the ends were shown twice
+                durations[0] = 2 * sum(runs[0]) - runs[0][0]
+                durations[-1] = 2 * sum(runs[-1]) - runs[-1][-1]
+            durations = [min(duration, MAXFRAMEDURATION) for duration in durations]
+            if len(set(durations)) == 1:
+                html_string += F"({durations[0]} ms):<BR>"
+            else:
+                html_string += F"({frames} frames, {sum(durations)} ms):<BR>"
+
+            html_string += f"<DIV ID={conf[CONF_ID]}>"
+            data = []
+            for data_frame in frame_data:
                 if width == 8:  
                     html_string += SVG_ICONSTART
                 else:
                     html_string += SVG_FULLSCREENSTART
-                i = 0
-                for pix in pixels:
-                    R = pix[0] >> 3
-                    G = pix[1] >> 2
-                    B = pix[2] >> 3
+                for i in range(width * height):
+                    rgb = (data_frame[2 * i] << 8) | data_frame[2 * i + 1]
                     x = (i % width)
                     y = i//width
-                    i +=1
-                    rgb = (R << 11) | (G << 5) | B
-                    html_string += rgb565_svg(x,y,R,G,B)
-                    data[pos] = rgb >> 8
-                    pos += 1
-                    data[pos] = rgb & 255
-                    pos += 1
+                    html_string += rgb565_svg(x,y,rgb >> 11,(rgb >> 5) & 63,rgb & 31)
                 html_string += SVG_END
+                data += data_frame
             html_string += f"</DIV>"
         
             rhs = [HexInt(x) for x in data]
 
             prog_arr = cg.progmem_array(conf[CONF_RAW_DATA_ID], rhs)
 
+            # a delay table is only needed if the frames differ in duration
+            if len(set(durations)) > 1:
+                duration_arr = cg.progmem_array(conf[CONF_DURATIONS_ID], durations)
+            else:
+                duration_arr = cg.nullptr
+
             cg.new_Pvariable(
                 conf[CONF_ID],
                 prog_arr,
@@ -669,7 +753,8 @@ async def to_code(config):
                 espImage.IMAGE_TYPE["RGB565"],
                 str(conf[CONF_ID]),
                 conf[CONF_PINGPONG],
-                duration,
+                durations[0],
+                duration_arr,
             )
 
             cg.add(var.add_icon(RawExpression(str(conf[CONF_ID]))))
@@ -694,6 +779,18 @@ async def to_code(config):
     f = await cg.get_variable(config[CONF_FONT_ID])
     cg.add(var.set_font(f))
 
+    try:
+        glyph_widths = glyph_width_table(config[CONF_FONT_ID])
+    except Exception as e:
+        logging.warning(f"EsphoMaTrix: Could not measure glyphs of {config[CONF_FONT_ID]}: {e}")
+        glyph_widths = None
+
+    if glyph_widths is None:
+        logging.info(f"EsphoMaTrix: no glyph width table for {config[CONF_FONT_ID]}, text is measured at runtime")
+    else:
+        glyph_arr = cg.static_const_array(config[CONF_GLYPHWIDTHS_ID], glyph_widths)
+        cg.add(var.set_glyph_widths(glyph_arr))
+
     ehmtxtime = await cg.get_variable(config[CONF_TIMECOMPONENT])
     cg.add(var.set_clock(ehmtxtime))
 
@@ -0,0 +1,41 @@
+GLYPH_UNKNOWN = -128
+
+def ttf_glyph_metrics(ttf, glyphs):
+    # offset_x and width per glyph, measured like the font component does
+    metrics = {}
+    for glyph in glyphs:
+        mask = ttf.getmask(glyph, mode="1")
+        _, (offset_x, _) = ttf.font.getsize(glyph)
+        width, _ = mask.size
+        metrics[glyph] = (offset_x, width)
+    return metrics
+
+def glyph_width_data(glyphs, metrics):
+    # offset_x and advance per ascii char, as used by Font::measure
+    # a char without glyph is marked with offset_x GLYPH_UNKNOWN
+    # None if the table can't give the same result as Font::measure
+    if len(glyphs) == 0:
+        return None
+
+    # a multi char glyph starting with an ascii char would change the matching of ascii text,
+    # non ascii glyphs are skipped, text with non ascii chars is measured at runtime
+    if any((len(glyph) > 1) and (ord(glyph[0]) < 128) for glyph in glyphs):
+        return None
+
+    # unknown chars advance by the width of the first glyph
+    unknown = metrics[glyphs[0]][1]
+    if not (-128 <= unknown <= 127):
+        return None
+
+    data = [GLYPH_UNKNOWN, unknown] * 128
+    for glyph in glyphs:
+        if (len(glyph) != 1) or (ord(glyph) > 127):
+            continue
+        offset_x, width = metrics[glyph]
+        advance = width + offset_x
+        # -128 is GLYPH_UNKNOWN and everything has to fit into int8_t
+        if not (-127 <= offset_x <= 127) or not (-128 <= advance <= 127):
+            return None
+        data[2 * ord(glyph)] = offset_x
+        data[2 * ord(glyph) + 1] = advance
+    return data
@@ -0,0 +1,21 @@
+def rgb565_expand(q, bits):
+    # 5/6 bit => 8 bit, like the HTML preview shows it
+    if bits == 5:
+        return (q << 3) | (q >> 2)
+    return (q << 2) | (q >> 4)
+
+def rgb565_lut(bits, gamma=None):
+    # lookup table 8 bit => 5/6 bit
+    # without gamma the lower bits are cut off, with gamma the code is chosen whose
+    # brightness on the panel, after the gamma correction of the light, is closest
+    if gamma is None:
+        return [v >> (8 - bits) for v in range(256)]
+    if gamma <= 0:
+        # the light doesn't correct a gamma of 0
+        gamma = 1.0
+    levels = [(rgb565_expand(q, bits) / 255) ** gamma for q in range(1 << bits)]
+    lut = []
+    for v in range(256):
+        target = (v / 255) ** gamma
+        lut.append(min(range(1 << bits), key=lambda q: abs(levels[q] - target)))
+    return lut
@@ -0,0 +1,44 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+COMPONENT = Path(__file__).resolve().parent.parent / "components" / "ehmtx"
+
+# load without the package __init__, that one needs esphome
+spec = importlib.util.spec_from_file_location("rgb565", COMPONENT / "rgb565.py")
+rgb565 = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rgb565)
+
+
+def test_without_gamma_cuts_off():
+    assert rgb565.rgb565_lut(5) == [v >> 3 for v in range(256)]
+    assert rgb565.rgb565_lut(6) == [v >> 2 for v in range(256)]
+
+
+@pytest.mark.parametrize("bits", [5, 6])
+def test_gamma_keeps_full_range(bits):
+    lut = rgb565.rgb565_lut(bits, 2.8)
+    assert lut[0] == 0
+    assert lut[255] == (1 << bits) - 1
+    assert lut == sorted(lut)
+
+
+def test_gamma_does_not_crush_darks():
+    lut = rgb565.rgb565_lut(5, 2.8)
+    assert max(v for v in range(256) if lut[v] == 0) == 6
+
+
+@pytest.mark.parametrize("bits", [5, 6])
+def test_gamma_picks_closest_panel_level(bits):
+    gamma = 2.8
+    lut = rgb565.rgb565_lut(bits, gamma)
+    for v in range(256):
+        target = (v / 255) ** gamma
+        error = abs((rgb565.rgb565_expand(lut[v], bits) / 255) ** gamma - target)
+        for q in range(1 << bits):
+            assert error <= abs((rgb565.rgb565_expand(q, bits) / 255) ** gamma - target)
+
+
+def test_gamma_zero_is_linear():
+    assert rgb565.rgb565_lut(5, 0) == rgb565.rgb565_lut(5, 1.0)
@@ -0,0 +1,133 @@
+import importlib.util
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPONENT = ROOT / "components" / "ehmtx"
+
+# load without the package __init__, that one needs esphome
+spec = importlib.util.spec_from_file_location("glyph_widths", COMPONENT / "glyph_widths.py")
+glyph_widths = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(glyph_widths)
+
+# offset_x and width per glyph, sorted like the font component sorts them
+GLYPHS = [" ", "%", ".", "0", "1", "2", "C", "j", "°"]
+METRICS = {
+    " ": (0, 2),
+    "%": (0, 5),
+    ".": (1, 1),
+    "0": (0, 4),
+    "1": (1, 2),
+    "2": (0, 4),
+    "C": (0, 4),
+    "j": (-1, 3),
+    "°": (0, 3),
+}
+
+TEXTS = [
+    "",
+    "0",
+    "21.5C",
+    "j",       # negative offset_x as first glyph
+    "1j",      # negative offset_x after a glyph
+    "j1j",
+    "x",       # unknown only
+    "xj",      # unknown before the first glyph
+    "1xyz2",   # unknown between glyphs
+    "100%",
+    " 1 ",
+]
+
+
+def font_measure(text, glyphs, metrics):
+    # port of Font::measure
+    x = 0
+    min_x = 0
+    has_char = False
+    i = 0
+    while i < len(text):
+        glyph = None
+        candidates = [g for g in glyphs if g <= text[i:]]
+        if candidates and text[i:].startswith(candidates[-1]):
+            glyph = candidates[-1]
+        if glyph is None:
+            x += metrics[glyphs[0]][1]
+            i += 1
+            continue
+        offset_x, width = metrics[glyph]
+        if not has_char:
+            min_x = offset_x
+        else:
+            min_x = min(min_x, x + offset_x)
+        x += width + offset_x
+        i += len(glyph)
+        has_char = True
+    return x - min_x
+
+
+@pytest.fixture(scope="module")
+def text_width_test(tmp_path_factory):
+    cxx = shutil.which("g++")
+    if cxx is None:
+        pytest.skip("g++ not found")
+    binary = tmp_path_factory.mktemp("build") / "text_width_test"
+    subprocess.run(
+        [cxx, "-std=c++11", "-Wall", "-I", str(COMPONENT),
+         str(ROOT / "tests" / "text_width_test.cpp"), str(COMPONENT / "EHMTX_textwidth.cpp"),
+         "-o", str(binary)],
+        check=True,
+    )
+    return binary
+
+
+def table_widths(binary, data, texts):
+    stdin = " ".join(str(v) for v in data) + "\n" + "\n".join(texts) + "\n"
+    out = subprocess.run([str(binary), "measure"], input=stdin, capture_output=True, text=True, check=True)
+    return out.stdout.split("\n")[: len(texts)]
+
+
+def test_table_layout():
+    data = glyph_widths.glyph_width_data(GLYPHS, METRICS)
+    assert len(data) == 256
+    assert data[2 * ord("j")] == -1
+    assert data[2 * ord("j") + 1] == 2
+    # unknown chars advance by the width of the first glyph
+    assert data[2 * ord("x")] == glyph_widths.GLYPH_UNKNOWN
+    assert data[2 * ord("x") + 1] == 2
+
+
+def test_non_ascii_glyphs_are_skipped():
+    assert glyph_widths.glyph_width_data(GLYPHS + ["€", "äb"], dict(METRICS, **{"€": (0, 5), "äb": (0, 6)})) is not None
+
+
+def test_multi_char_ascii_glyph():
+    assert glyph_widths.glyph_width_data(GLYPHS + ["ab"], dict(METRICS, ab=(0, 6))) is None
+
+
+@pytest.mark.parametrize("metric", [(-128, 3), (-200, 3), (128, 0), (0, 128), (100, 50)])
+def test_out_of_int8_range(metric):
+    assert glyph_widths.glyph_width_data(GLYPHS, dict(METRICS, C=metric)) is None
+
+
+def test_unknown_width_out_of_int8_range():
+    assert glyph_widths.glyph_width_data(GLYPHS, dict(METRICS, **{" ": (0, 200)})) is None
+
+
+def test_table_width_matches_font_measure(text_width_test):
+    data = glyph_widths.glyph_width_data(GLYPHS, METRICS)
+    expected = [str(font_measure(text, GLYPHS, METRICS)) for text in TEXTS]
+    assert table_widths(text_width_test, data, TEXTS) == expected
+
+
+def test_non_ascii_text_is_measured_at_runtime(text_width_test):
+    data = glyph_widths.glyph_width_data(GLYPHS, METRICS)
+    assert table_widths(text_width_test, data, ["21.5°C"]) == ["runtime"]
+
+
+def test_lru_order(text_width_test):
+    out = subprocess.run([str(text_width_test), "lru"], capture_output=True, text=True)
+    assert out.stdout.strip() == "ok"
+    assert out.returncode == 0
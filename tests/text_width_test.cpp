@@ -0,0 +1,86 @@
+// host side test driver for EHMTX_textwidth, built by test_text_width.py
+//   text_width_test measure < table_and_texts: prints the table width of each text
+//   text_width_test lru: checks the order of the width cache
+#include "EHMTX_textwidth.h"
+#include <cstdio>
+#include <cstring>
+#include <iostream>
+
+using esphome::EHMTX_textwidth;
+
+static int fail(const char *msg)
+{
+  printf("FAIL %s\n", msg);
+  return 1;
+}
+
+static int measure()
+{
+  int8_t table[256];
+  for (int i = 0; i < 256; i++)
+  {
+    int v;
+    std::cin >> v;
+    table[i] = (int8_t)v;
+  }
+  std::string text;
+  std::getline(std::cin, text); // rest of the table line
+  EHMTX_textwidth widths;
+  widths.set_glyph_widths(table);
+  while (std::getline(std::cin, text))
+  {
+    uint16_t w;
+    if (widths.table_width(text, &w))
+    {
+      printf("%d\n", (int16_t)w);
+    }
+    else
+    {
+      printf("runtime\n");
+    }
+  }
+  return 0;
+}
+
+static int lru()
+{
+  EHMTX_textwidth widths;
+  uint16_t w;
+  if (widths.find("a", &w))
+    return fail("empty cache");
+  for (uint8_t i = 0; i < TEXTWIDTHCACHE; i++)
+  {
+    widths.insert(std::string(1, 'a' + i), i);
+  }
+  // "a" is the oldest entry, a hit makes it the newest
+  if (!widths.find("a", &w) || w != 0)
+    return fail("find a");
+  // the cache is full, so "b" as least recently used entry is dropped
+  widths.insert("new", 100);
+  if (widths.find("b", &w))
+    return fail("b not dropped");
+  if (!widths.find("a", &w) || w != 0)
+    return fail("a dropped");
+  if (!widths.find("new", &w) || w != 100)
+    return fail("find new");
+  // "c" is the oldest now
+  widths.insert("new2", 101);
+  if (widths.find("c", &w))
+    return fail("c not dropped");
+  for (uint8_t i = 3; i < TEXTWIDTHCACHE; i++)
+  {
+    if (!widths.find(std::string(1, 'a' + i), &w) || w != i)
+      return fail("find d..");
+  }
+  printf("ok\n");
+  return 0;
+}
+
+int main(int argc, char **argv)
+{
+  if (argc > 1 && strcmp(argv[1], "measure") == 0)
+    return measure();
+  if (argc > 1 && strcmp(argv[1], "lru") == 0)
+    return lru();
+  return fail("usage: text_width_test measure|lru");
+}